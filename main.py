@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait
+import itertools
+import os
+import queue
 import threading
 import subprocess
 import sys
+import time
+import urllib.parse
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -14,23 +19,64 @@ try:
 except Exception:  # noqa: BLE001
     dnd = None
 
+try:
+    # Optional: native Windows toasts without spawning powershell.exe.
+    from winsdk.windows.data.xml.dom import XmlDocument
+    from winsdk.windows.ui.notifications import ToastNotification, ToastNotificationManager
+    _WIN_TOAST = True
+except Exception:  # noqa: BLE001
+    _WIN_TOAST = False
+
 import yt_dlp
 from yt_dlp.extractor.youtube import YoutubeIE
 
 OUTPUT_DIR = Path("downloads")
 MAX_WORKERS = 4  # Bump up or down based on your bandwidth/CPU budget.
+MAX_PLAYLIST_ITEMS = 1000  # Safety valve for absurdly large playlists.
 ARCHIVE_FILE = OUTPUT_DIR / "downloaded.txt"
 
+# ToastText02 payload, built once; only used when winsdk is available.
+_TOAST_XML = (
+    "<toast><visual><binding template='ToastText02'>"
+    "<text id='1'>Downloader</text>"
+    "<text id='2'>All downloads finished</text>"
+    "</binding></visual></toast>"
+)
 
-def find_existing_path(url: str, dest_dir: Path = OUTPUT_DIR) -> Optional[Path]:
-    """Return an existing downloaded file path for this URL, if present."""
+
+def normalize_url(url: str) -> str:
+    """Strip tracking params (utm_*, si) so duplicate pastes compare equal."""
+    try:
+        parts = urllib.parse.urlsplit(url)
+    except ValueError:
+        return url
+    if not parts.query:
+        return url
+    query = [
+        (key, value)
+        for key, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if not key.startswith("utm_") and key != "si"
+    ]
+    return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+
+
+def single_video_id(url: str) -> Optional[str]:
+    """Return the video id for a plain single-video YouTube URL, else None."""
+    try:
+        parts = urllib.parse.urlsplit(url)
+    except ValueError:
+        return None
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host not in ("youtube.com", "youtu.be", "m.youtube.com", "music.youtube.com"):
+        return None
+    if "list" in urllib.parse.parse_qs(parts.query):
+        return None
     try:
-        video_id = YoutubeIE.extract_id(url)
+        return YoutubeIE.extract_id(url)
     except Exception:
         return None
-    for path in dest_dir.glob(f"{video_id} - *.mp3"):
-        return path
-    return None
 
 
 if __name__ == "__main__":
@@ -43,9 +89,46 @@ if __name__ == "__main__":
                 self.download_dir = OUTPUT_DIR.resolve()
                 self.item_paths: Dict[str, Optional[Path]] = {}
                 self.item_progress: Dict[str, float] = {}
+                self._progress_sum = 0.0  # running sum of item_progress values
                 self.cancelled = False
 
+                # Pending row updates, merged per item and applied in one
+                # pass by _flush_dirty rather than one after(0) per tick.
+                self._dirty_lock = threading.Lock()
+                self._dirty: Dict[str, Dict[str, object]] = {}
+
+                # Bounded pool for metadata lookups; pasting 200 URLs should
+                # not spawn 200 threads all hitting YouTube at once.
+                self._meta_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="meta")
+                self._dl_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="dl")
+
+                # YoutubeDL construction loads the whole extractor registry,
+                # so reuse instances: one shared extract-only instance for
+                # metadata, and per-worker-thread instances for downloads.
+                self._meta_ydl: Optional[yt_dlp.YoutubeDL] = None
+                self._meta_ydl_lock = threading.Lock()
+                self._dl_local = threading.local()
+
+                # {video_id: path string} for files already in download_dir,
+                # built with one scandir instead of a glob per URL.
+                self._existing_index: Optional[Dict[str, str]] = None
+                self._existing_lock = threading.Lock()
+
+                # Download archive held in memory; new ids are queued and a
+                # writer thread appends them in batches, so workers never
+                # contend on downloaded.txt.
+                self._archive_ids: set = set()
+                self._archive_queue: queue.Queue = queue.Queue()
+                self._archive_thread = threading.Thread(target=self._archive_writer, daemon=True)
+                self._archive_thread.start()
+
+                # Normalized URLs already in the tree; re-pastes and re-drops
+                # of the same link are dropped instead of re-fetched.
+                self._queued_urls: set = set()
+
                 self._build_ui()
+                self.protocol("WM_DELETE_WINDOW", self._on_close)
+                self.after(100, self._flush_dirty)
 
             def _build_ui(self) -> None:
                 # Entry + add/remove
@@ -94,7 +177,8 @@ if __name__ == "__main__":
                 self.tree.bind("<ButtonRelease-1>", self._handle_click)
 
                 # Action buttons
-                btn_frame = ttk.Frame(self)
+                self.btn_frame = ttk.Frame(self)
+                btn_frame = self.btn_frame
                 btn_frame.pack(fill="x", padx=10, pady=10)
                 self.download_btn = ttk.Button(btn_frame, text="Download", command=self.start_downloads)
                 self.download_btn.pack(side="left")
@@ -105,13 +189,24 @@ if __name__ == "__main__":
                 self.cancel_btn = ttk.Button(btn_frame, text="Cancel", command=self.cancel_downloads)
                 self.cancel_btn.pack(side="left", padx=6)
 
+            def _enqueue_url(self, url: str) -> None:
+                # Plain watch URLs skip the metadata round-trip entirely;
+                # the real title arrives when the download runs.
+                video_id = single_video_id(url)
+                if video_id is not None:
+                    self._add_row(f"[{video_id}]", url, "0%", "pending")
+                    return
+                item_id = self._add_row("Resolving...", url, "0%", "pending")
+                if item_id is None:
+                    return
+                self._meta_pool.submit(self._process_url, item_id, url)
+
             def add_url(self) -> None:
-                url = self.url_var.get().strip()
+                url = normalize_url(self.url_var.get().strip())
                 if not url:
                     return
-                item_id = self._add_row("Resolving...", url, "0%", "pending")
                 self.url_var.set("")
-                threading.Thread(target=self._process_url, args=(item_id, url), daemon=True).start()
+                self._enqueue_url(url)
 
             def add_multiple(self) -> None:
                 # Allow multi-paste (one URL per line)
@@ -119,27 +214,26 @@ if __name__ == "__main__":
                 if not text:
                     return
                 for line in text.splitlines():
-                    url = line.strip()
+                    url = normalize_url(line.strip())
                     if not url:
                         continue
-                    item_id = self._add_row("Resolving...", url, "0%", "pending")
-                    threading.Thread(target=self._process_url, args=(item_id, url), daemon=True).start()
+                    self._enqueue_url(url)
 
             def _on_drop(self, event: tk.Event) -> None:
                 data = getattr(event, "data", "") or ""
                 # tkdnd wraps items in braces and space separates them.
                 parts = [p.strip("{}") for p in data.split()]
                 for part in parts:
-                    url = part.strip()
+                    url = normalize_url(part.strip())
                     if not url:
                         continue
-                    item_id = self._add_row("Resolving...", url, "0%", "pending")
-                    threading.Thread(target=self._process_url, args=(item_id, url), daemon=True).start()
+                    self._enqueue_url(url)
 
             def remove_selected(self) -> None:
                 for item in self.tree.selection():
+                    self._queued_urls.discard(self.tree.set(item, "url"))
                     self.item_paths.pop(item, None)
-                    self.item_progress.pop(item, None)
+                    self._progress_sum -= self.item_progress.pop(item, 0.0)
                     self.tree.delete(item)
 
             def _add_row(
@@ -148,22 +242,45 @@ if __name__ == "__main__":
                 url: str,
                 progress: str = "0%",
                 status: str = "pending",
-            ) -> str:
+            ) -> Optional[str]:
+                if url in self._queued_urls:
+                    return None
+                self._queued_urls.add(url)
                 item_id = self.tree.insert("", "end", values=(title, url, progress, status, "Show", "Retry"))
                 self.item_paths[item_id] = None
-                self.item_progress[item_id] = float(progress.strip("%")) if "%" in progress else 0.0
+                value = float(progress.strip("%")) if "%" in progress else 0.0
+                self.item_progress[item_id] = value
+                self._progress_sum += value
                 return item_id
 
+            def _bulk_add_rows(self, rows: List[tuple]) -> None:
+                # Insert many rows with the Treeview hidden so Tk redraws once,
+                # not once per row (noticeable on 500-item playlists).
+                self.tree.pack_forget()
+                try:
+                    for title, url in rows:
+                        self._add_row(title, url)
+                finally:
+                    self.tree.pack(fill="both", expand=True, padx=10, pady=10, before=self.btn_frame)
+
+            def _get_meta_ydl(self) -> yt_dlp.YoutubeDL:
+                with self._meta_ydl_lock:
+                    if self._meta_ydl is None:
+                        self._meta_ydl = yt_dlp.YoutubeDL(
+                            {
+                                "quiet": True,
+                                "skip_download": True,
+                                "extract_flat": "in_playlist",
+                                "noplaylist": False,
+                            }
+                        )
+                    return self._meta_ydl
+
             def _process_url(self, item_id: str, url: str) -> None:
-                opts = {
-                    "quiet": True,
-                    "skip_download": True,
-                    "extract_flat": True,
-                    "noplaylist": False,
-                }
                 try:
-                    with yt_dlp.YoutubeDL(opts) as ydl:
-                        info = ydl.extract_info(url, download=False)
+                    # process=False skips per-entry post-processing; only the
+                    # url/id and title of each flat entry are needed here.
+                    info = self._get_meta_ydl().extract_info(url, download=False, process=False)
                 except Exception:
                     # Fallback: keep URL as title
                     self._update_row(item_id, title=url)
@@ -173,31 +290,76 @@ if __name__ == "__main__":
                     self._update_row(item_id, title=url)
                     return
 
-                if info.get("_type") == "playlist" and info.get("entries"):
+                entries = info.get("entries")
+                if info.get("_type") == "playlist" and entries is not None:
+                    # Walk entries once (they may be a generator) and flush
+                    # in chunks so huge playlists never sit fully in memory.
+                    # The islice cap also stops the generator from fetching
+                    # continuation pages forever (playlist_items is ignored
+                    # when extract_info runs with process=False).
+                    entry_iter = itertools.islice(iter(entries), MAX_PLAYLIST_ITEMS)
+                    chunk = list(itertools.islice(entry_iter, 64))
+                    if not chunk:
+                        # Empty playlist: keep the user's row, just retitle it.
+                        self._update_row(item_id, title=info.get("title") or url)
+                        return
+
                     # Remove placeholder row and add each entry.
                     def remove_placeholder() -> None:
                         self.tree.delete(item_id)
+                        self._queued_urls.discard(url)
                         self.item_paths.pop(item_id, None)
-                        self.item_progress.pop(item_id, None)
+                        self._progress_sum -= self.item_progress.pop(item_id, 0.0)
 
                     self.after(0, remove_placeholder)
-                    for entry in info.get("entries", []):
-                        entry_url = entry.get("url") or entry.get("id")
-                        if not entry_url:
-                            continue
-                        if not entry_url.startswith("http"):
-                            entry_url = f"https://www.youtube.com/watch?v={entry_url}"
-                        title = entry.get("title") or entry_url
-                        self.after(0, lambda t=title, u=entry_url: self._add_row(t, u))
+                    while chunk:
+                        rows: List[tuple] = []
+                        for entry in chunk:
+                            entry_url = entry.get("url") or entry.get("id")
+                            if not entry_url:
+                                continue
+                            if not entry_url.startswith("http"):
+                                entry_url = f"https://www.youtube.com/watch?v={entry_url}"
+                            title = entry.get("title") or entry_url
+                            rows.append((title, entry_url))
+                        if rows:
+                            self.after(0, lambda r=rows: self._bulk_add_rows(r))
+                        chunk = list(itertools.islice(entry_iter, 64))
                 else:
                     title = info.get("title") or url
                     self._update_row(item_id, title=title)
 
+            def _get_existing_index(self) -> Dict[str, str]:
+                with self._existing_lock:
+                    if self._existing_index is None:
+                        index: Dict[str, str] = {}
+                        try:
+                            with os.scandir(self.download_dir) as entries:
+                                for entry in entries:
+                                    if entry.name.endswith(".mp3"):
+                                        index[entry.name.split(" - ", 1)[0]] = entry.path
+                        except OSError:
+                            pass
+                        self._existing_index = index
+                    return self._existing_index
+
+            def find_existing_path(self, url: str) -> Optional[Path]:
+                """Return an existing downloaded file path for this URL, if present."""
+                try:
+                    video_id = YoutubeIE.extract_id(url)
+                except Exception:
+                    return None
+                # Index values stay plain strings; only the hit pays for a Path.
+                path = self._get_existing_index().get(video_id)
+                return Path(path) if path else None
+
             def choose_folder(self) -> None:
                 chosen = filedialog.askdirectory(initialdir=self.download_dir)
                 if chosen:
                     self.download_dir = Path(chosen)
                     self.folder_label.config(text=str(self.download_dir))
+                    with self._existing_lock:
+                        self._existing_index = None
 
             def start_downloads(self) -> None:
                 item_ids = list(self.tree.get_children())
@@ -207,7 +369,7 @@ if __name__ == "__main__":
 
                 # Immediate feedback
                 for item_id in item_ids:
-                    self._update_row(item_id, progress="0%", status="queued")
+                    self._update_row(item_id, progress=0.0, status="queued")
                 self.status_var.set("Starting downloads...")
                 self.global_progress["value"] = 0
                 self.cancelled = False
@@ -215,16 +377,14 @@ if __name__ == "__main__":
                 threading.Thread(target=self._run_downloads, args=(item_ids,), daemon=True).start()
 
             def _run_downloads(self, item_ids: List[str]) -> None:
-                archive_file = self.download_dir / "downloaded.txt"
+                self._load_archive(self.download_dir / "downloaded.txt")
                 self.status_var.set("Downloading...")
 
-                with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-                    futures = []
-                    for item_id in item_ids:
-                        url = self.tree.item(item_id, "values")[1]
-                        futures.append(executor.submit(self._download_item, item_id, url, archive_file))
-                    for future in futures:
-                        future.result()
+                futures = []
+                for item_id in item_ids:
+                    url = self.tree.set(item_id, "url")
+                    futures.append(self._dl_pool.submit(self._download_item, item_id, url))
+                wait(futures)
 
                 self.after(0, lambda: self.download_btn.config(state="normal"))
                 self.status_var.set("Done")
@@ -235,84 +395,195 @@ if __name__ == "__main__":
                 self.status_var.set("Cancelling...")
                 self.download_btn.config(state="normal")
 
-            def _download_item(self, item_id: str, url: str, archive_file: Path) -> None:
-                def progress_hook(d: dict) -> None:
-                    status = d.get("status")
-                    if self.cancelled:
-                        raise yt_dlp.utils.DownloadCancelled("User cancelled")
-                    if status == "downloading":
-                        total = d.get("total_bytes") or d.get("total_bytes_estimate") or 1
-                        downloaded = d.get("downloaded_bytes", 0)
-                        percent = downloaded / total
-                        self._update_row(item_id, progress=f"{percent*100:.1f}%", status="downloading")
-                    elif status == "finished":
-                        self._update_row(item_id, progress="100%", status="postprocessing")
-                    elif status == "error":
-                        self._update_row(item_id, progress="0%", status="error")
-
-                existing_path = find_existing_path(url, self.download_dir)
+            def _on_close(self) -> None:
+                self.cancelled = True
+                self._meta_pool.shutdown(wait=False, cancel_futures=True)
+                self._dl_pool.shutdown(wait=False, cancel_futures=True)
+                # Flush any archive ids still sitting in the queue before the
+                # daemon writer dies with the process.
+                self._archive_queue.put(None)
+                self._archive_thread.join(timeout=3.0)
+                self.destroy()
+
+            def _progress_hook(self, d: dict) -> None:
+                item_id = self._dl_local.item_id
+                status = d.get("status")
+                if self.cancelled:
+                    raise yt_dlp.utils.DownloadCancelled("User cancelled")
+                if status == "downloading":
+                    # yt-dlp ticks dozens of times a second; cap row updates
+                    # at ~10 Hz per item, letting terminal states through.
+                    now = time.monotonic()
+                    if now - getattr(self._dl_local, "last_emit", 0.0) < 0.1:
+                        return
+                    self._dl_local.last_emit = now
+                    total = d.get("total_bytes") or d.get("total_bytes_estimate") or 1
+                    downloaded = d.get("downloaded_bytes", 0)
+                    percent = downloaded / total
+                    self._update_row(item_id, progress=percent * 100, status="downloading")
+                elif status == "finished":
+                    self._update_row(item_id, progress=100.0, status="postprocessing")
+                elif status == "error":
+                    self._update_row(item_id, progress=0.0, status="error")
+
+            def _load_archive(self, archive_file: Path) -> None:
+                ids = set()
+                try:
+                    with open(archive_file) as fh:
+                        for line in fh:
+                            line = line.strip()
+                            if line:
+                                ids.add(line.rsplit(" ", 1)[-1])
+                except OSError:
+                    pass
+                self._archive_ids = ids
+
+            def _archive_writer(self) -> None:
+                # Sleep briefly after the first queued entry so a burst of
+                # finished downloads lands in one append. Entries carry the
+                # archive path they belong to, so ids finished under an old
+                # folder never land in the new folder's archive. A None
+                # sentinel flushes whatever is pending and exits.
+                closing = False
+                while not closing:
+                    first = self._archive_queue.get()
+                    if first is None:
+                        break
+                    entries = [first]
+                    time.sleep(1.0)
+                    while True:
+                        try:
+                            entry = self._archive_queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if entry is None:
+                            closing = True
+                            break
+                        entries.append(entry)
+                    by_file: Dict[str, List[str]] = {}
+                    for archive_path, line in entries:
+                        by_file.setdefault(archive_path, []).append(line)
+                    for archive_path, lines in by_file.items():
+                        try:
+                            with open(archive_path, "a") as fh:
+                                fh.writelines(lines)
+                        except OSError:
+                            pass
+
+            def _get_download_ydl(self) -> yt_dlp.YoutubeDL:
+                # YoutubeDL instances are not safe to share across threads,
+                # so cache one per worker thread per download dir.
+                cache = getattr(self._dl_local, "ydls", None)
+                if cache is None:
+                    cache = self._dl_local.ydls = {}
+                key = str(self.download_dir)
+                ydl = cache.get(key)
+                if ydl is None:
+                    ydl = yt_dlp.YoutubeDL(
+                        {
+                            "format": "bestaudio/best",
+                            "outtmpl": str(self.download_dir / "%(id)s - %(title)s.%(ext)s"),
+                            "noplaylist": True,
+                            "quiet": False,
+                            "overwrites": False,
+                            "progress_hooks": [self._progress_hook],
+                            "postprocessors": [
+                                {
+                                    "key": "FFmpegExtractAudio",
+                                    "preferredcodec": "mp3",
+                                    "preferredquality": "192",
+                                }
+                            ],
+                        }
+                    )
+                    cache[key] = ydl
+                return ydl
+
+            def _download_item(self, item_id: str, url: str) -> None:
+                existing_path = self.find_existing_path(url)
                 if existing_path:
                     self._set_item_path(item_id, existing_path)
-                    self._update_row(item_id, progress="100%", status="skipped (exists)")
+                    self._update_row(item_id, progress=100.0, status="skipped (exists)")
+                    return
+                try:
+                    video_id = YoutubeIE.extract_id(url)
+                except Exception:
+                    video_id = None
+                if video_id and video_id in self._archive_ids:
+                    self._update_row(item_id, progress=100.0, status="skipped (archived)")
                     return
                 if self.cancelled:
-                    self._update_row(item_id, progress="0%", status="cancelled")
+                    self._update_row(item_id, progress=0.0, status="cancelled")
                     return
 
-                ydl_opts = {
-                    "format": "bestaudio/best",
-                    "outtmpl": str(self.download_dir / "%(id)s - %(title)s.%(ext)s"),
-                    "noplaylist": True,
-                    "quiet": False,
-                    "overwrites": False,
-                    "download_archive": str(archive_file),
-                    "progress_hooks": [progress_hook],
-                    "postprocessors": [
-                        {
-                            "key": "FFmpegExtractAudio",
-                            "preferredcodec": "mp3",
-                            "preferredquality": "192",
-                        }
-                    ],
-                }
-
                 self.download_dir.mkdir(parents=True, exist_ok=True)
 
+                self._dl_local.item_id = item_id
+                self._dl_local.last_emit = 0.0
                 try:
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        info = ydl.extract_info(url, download=True)
-                        filename = ydl.prepare_filename(info)
-                        final_path = Path(filename).with_suffix(".mp3")
+                    ydl = self._get_download_ydl()
+                    info = ydl.extract_info(url, download=True)
+                    filename = ydl.prepare_filename(info)
+                    final_path = Path(filename).with_suffix(".mp3")
                     self._set_item_path(item_id, final_path)
-                    self._update_row(item_id, progress="100%", status="done")
+                    video_id = (info or {}).get("id")
+                    if video_id:
+                        with self._existing_lock:
+                            if self._existing_index is not None:
+                                self._existing_index[video_id] = str(final_path)
+                        if video_id not in self._archive_ids:
+                            self._archive_ids.add(video_id)
+                            self._archive_queue.put(
+                                (str(self.download_dir / "downloaded.txt"), f"youtube {video_id}\n")
+                            )
+                    self._update_row(
+                        item_id,
+                        title=(info or {}).get("title"),
+                        progress=100.0,
+                        status="done",
+                    )
                 except Exception as exc:  # noqa: BLE001
-                    self._update_row(item_id, progress="0%", status=f"error: {exc}")
+                    self._update_row(item_id, progress=0.0, status=f"error: {exc}")
 
             def _update_row(
                 self,
                 item_id: str,
                 title: Optional[str] = None,
-                progress: Optional[str] = None,
+                progress: Optional[float] = None,
                 status: Optional[str] = None,
             ) -> None:
-                def update() -> None:
-                    current = list(self.tree.item(item_id, "values"))
+                changes = {"title": title, "progress": progress, "status": status}
+                with self._dirty_lock:
+                    self._dirty.setdefault(item_id, {}).update(
+                        {key: value for key, value in changes.items() if value is not None}
+                    )
+
+            def _flush_dirty(self) -> None:
+                with self._dirty_lock:
+                    pending, self._dirty = self._dirty, {}
+                for item_id, changes in pending.items():
+                    if not self.tree.exists(item_id):
+                        continue
+                    # Write only the dirty columns; reading and rewriting the
+                    # whole values tuple crosses the Tcl bridge twice per row.
+                    title = changes.get("title")
+                    progress = changes.get("progress")
+                    status = changes.get("status")
                     if title is not None:
-                        current[0] = title
+                        self.tree.set(item_id, "title", title)
                     if progress is not None:
-                        current[2] = progress
-                        try:
-                            self.item_progress[item_id] = float(progress.strip("%"))
-                        except Exception:
-                            self.item_progress[item_id] = 0.0
+                        # Progress travels as a float; the display string is
+                        # formatted once here rather than parsed back out.
+                        self.tree.set(item_id, "progress", f"{progress:.1f}%")
+                        self._progress_sum += progress - self.item_progress.get(item_id, 0.0)
+                        self.item_progress[item_id] = progress
                     if status is not None:
-                        current[3] = status
+                        self.tree.set(item_id, "status", status)
                         if status.startswith("error"):
-                            current[5] = "Retry"
-                    self.tree.item(item_id, values=current)
+                            self.tree.set(item_id, "retry", "Retry")
+                if pending:
                     self._update_global_progress()
-
-                self.after(0, update)
+                self.after(100, self._flush_dirty)
 
             def _set_item_path(self, item_id: str, path: Path) -> None:
                 self.item_paths[item_id] = path
@@ -330,13 +601,9 @@ if __name__ == "__main__":
 
             def _retry_item(self, item_id: str) -> None:
                 # Re-run a single failed/skipped download
-                url = self.tree.item(item_id, "values")[1]
-                self._update_row(item_id, progress="0%", status="queued")
-                threading.Thread(
-                    target=self._download_item,
-                    args=(item_id, url, self.download_dir / "downloaded.txt"),
-                    daemon=True,
-                ).start()
+                url = self.tree.set(item_id, "url")
+                self._update_row(item_id, progress=0.0, status="queued")
+                self._dl_pool.submit(self._download_item, item_id, url)
 
             def show_in_folder(self, item_id: Optional[str] = None) -> None:
                 if item_id is None:
@@ -347,8 +614,8 @@ if __name__ == "__main__":
 
                 path = self.item_paths.get(item_id)
                 if not path or not path.exists():
-                    url = self.tree.item(item_id, "values")[1]
-                    path = find_existing_path(url, self.download_dir)
+                    url = self.tree.set(item_id, "url")
+                    path = self.find_existing_path(url)
                     if not path:
                         messagebox.showinfo("Not found", "File not found on disk yet.")
                         return
@@ -356,14 +623,24 @@ if __name__ == "__main__":
 
                 self._reveal_file(path)
 
+            def _spawn(self, args: List[str]) -> None:
+                # Fire-and-forget: osascript/powershell can take hundreds of
+                # ms, so never wait on them from the Tk mainloop.
+                kwargs: dict = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+                if sys.platform.startswith("win"):
+                    kwargs["creationflags"] = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+                else:
+                    kwargs["start_new_session"] = True
+                subprocess.Popen(args, **kwargs)
+
             def _reveal_file(self, path: Path) -> None:
                 try:
                     if sys.platform.startswith("darwin"):
-                        subprocess.run(["open", "-R", str(path)], check=False)
+                        self._spawn(["open", "-R", str(path)])
                     elif sys.platform.startswith("win"):
-                        subprocess.run(["explorer", "/select,", str(path)], check=False)
+                        self._spawn(["explorer", "/select,", str(path)])
                     else:
-                        subprocess.run(["xdg-open", str(path.parent)], check=False)
+                        self._spawn(["xdg-open", str(path.parent)])
                 except Exception:
                     messagebox.showinfo("Open failed", f"Could not open folder for {path}")
 
@@ -371,17 +648,20 @@ if __name__ == "__main__":
                 if not self.item_progress:
                     self.global_progress["value"] = 0
                     return
-                avg = sum(self.item_progress.values()) / len(self.item_progress)
-                self.global_progress["value"] = avg
+                self.global_progress["value"] = self._progress_sum / len(self.item_progress)
 
             def _notify_complete(self) -> None:
                 # Try a lightweight notification; fallback to status label
                 try:
                     if sys.platform.startswith("darwin"):
-                        subprocess.run(
+                        self._spawn(
                             ["osascript", "-e", 'display notification "All downloads finished" with title "Downloader"'],
-                            check=False,
                         )
+                    elif sys.platform.startswith("win") and _WIN_TOAST:
+                        xml = XmlDocument()
+                        xml.load_xml(_TOAST_XML)
+                        notifier = ToastNotificationManager.create_toast_notifier("Downloader")
+                        notifier.show(ToastNotification(xml))
                     elif sys.platform.startswith("win"):
                         script = (
                             "[Windows.UI.Notifications.ToastNotificationManager, Windows.UI.Notifications, "
@@ -394,9 +674,9 @@ if __name__ == "__main__":
                             "$notifier = [Windows.UI.Notifications.ToastNotificationManager]::CreateToastNotifier('Downloader');"
                             "$notifier.Show($toast);"
                         )
-                        subprocess.run(["powershell", "-Command", script], check=False)
+                        self._spawn(["powershell", "-Command", script])
                     else:
-                        subprocess.run(["notify-send", "Downloader", "All downloads finished"], check=False)
+                        self._spawn(["notify-send", "Downloader", "All downloads finished"])
                 except Exception:
                     pass
 